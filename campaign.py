@@ -0,0 +1,450 @@
+"""Campaign-style bulk sending: batching, retries and pacing.
+
+/send-emails covers small transactional payloads; this router drives large
+campaigns where individual failures are retried with backoff and the
+response reports aggregate progress instead of echoing every recipient.
+"""
+
+import asyncio
+import io
+import random
+from collections import deque
+from email.generator import BytesGenerator
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.policy import SMTP as _SMTP_POLICY
+from typing import List, Optional
+
+import aiosmtplib
+import httpx
+from fastapi import APIRouter
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+
+from email_sender import SMTP_FROM, _acquire_client, _release_client
+
+router = APIRouter()
+
+# retry pacing: exponential backoff with full jitter, so workers that failed
+# in the same rate-limit wave don't come back in lockstep and re-trigger it
+_BACKOFF_BASE = 0.5
+_BACKOFF_CAP = 30.0
+
+
+def _backoff(attempt: int, jitter: bool = True) -> float:
+    delay = min(_BACKOFF_CAP, _BACKOFF_BASE * (2**attempt))
+    if jitter:
+        return random.uniform(0, delay)
+    return delay
+
+
+class CampaignEmail(BaseModel):
+    # frozen models skip per-instance __dict__ mutation plumbing; 10k-item
+    # payloads are parsed once and never written to
+    model_config = ConfigDict(frozen=True)
+
+    to: str
+    subject: str
+    text_body: str = ""
+    html_body: str = ""
+
+
+class EmailRequest(BaseModel):
+    emails: List[CampaignEmail]
+    batch_size: int = Field(default=50, ge=1, le=1000)
+    # async SMTP conversations are cheap to multiplex — no thread per
+    # connection — so the ceiling is what the provider tolerates, not 20
+    concurrent_connections: int = Field(default=10, ge=1, le=200)
+    delay_between_batches: float = Field(default=1.0, ge=0.0)
+    max_retries: int = Field(default=3, ge=0, le=10)
+    # providers cap how many messages one connection may carry (SendGrid 5k,
+    # Gmail/Yahoo lower); past the cap they 421 or silently drop
+    emails_per_connection: int = Field(default=500, ge=1, le=5000)
+    # opt-out knob for callers that need deterministic retry timing
+    jitter: bool = True
+    # permanent failures are POSTed here one by one; the response only ever
+    # carries the capped sample either way
+    dead_letter_url: Optional[HttpUrl] = None
+
+
+class BulkEmailRequest(BaseModel):
+    """Columnar variant of EmailRequest for template campaigns.
+
+    One shared body plus a flat recipient array parses as len(to_emails)
+    strings instead of that many model objects — a 10k-recipient payload
+    costs one validation pass and a fraction of the memory.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    to_emails: List[str]
+    subject: str
+    text_body: str = ""
+    html_body: str = ""
+    concurrent_connections: int = Field(default=10, ge=1, le=200)
+    delay_between_batches: float = Field(default=1.0, ge=0.0)
+    max_retries: int = Field(default=3, ge=0, le=10)
+    emails_per_connection: int = Field(default=500, ge=1, le=5000)
+    jitter: bool = True
+    dead_letter_url: Optional[HttpUrl] = None
+
+
+# failure details kept in the response; beyond this only the counter grows
+_FAILED_SAMPLE = 100
+
+# shared client for dead-letter webhooks; bounded so a failure wave can't
+# open an unbounded number of outbound requests
+_dead_letter_http = httpx.AsyncClient(timeout=5.0)
+_dead_letter_limit = asyncio.Semaphore(10)
+
+
+@router.on_event("shutdown")
+async def _close_dead_letter_client():
+    await _dead_letter_http.aclose()
+
+
+async def _post_dead_letter(url: str, item: dict):
+    async with _dead_letter_limit:
+        try:
+            await _dead_letter_http.post(url, json=item)
+        except httpx.HTTPError:
+            # the webhook is best-effort; the failure is still counted in the
+            # response either way
+            pass
+
+
+class _FailureLog:
+    """First _FAILED_SAMPLE failure details plus a running total, so a large
+    failure wave costs a counter increment per email instead of materializing
+    millions of dicts that the response would slice away anyway. With a
+    dead_letter_url every permanent failure is also POSTed out-of-band."""
+
+    __slots__ = ("sample", "count", "dead_letter_url", "_posts")
+
+    def __init__(self, dead_letter_url=None):
+        self.sample = deque(maxlen=_FAILED_SAMPLE)
+        self.count = 0
+        self.dead_letter_url = dead_letter_url
+        self._posts = []
+
+    def append(self, item):
+        self.count += 1
+        if len(self.sample) < _FAILED_SAMPLE:
+            self.sample.append(item)
+        if self.dead_letter_url is not None:
+            self._posts.append(
+                asyncio.get_running_loop().create_task(
+                    _post_dead_letter(self.dead_letter_url, item)
+                )
+            )
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    async def flush(self):
+        # let in-flight webhook deliveries finish before the response closes
+        if self._posts:
+            await asyncio.gather(*self._posts, return_exceptions=True)
+            self._posts.clear()
+
+
+class TokenBucket:
+    """Rate-shape batch admission: permits refill continuously, so a quiet
+    spell banks up to ``capacity`` tokens and a burst drains them without
+    every batch queueing behind a fixed schedule."""
+
+    def __init__(self, capacity: int, refill_rate: float):
+        self._capacity = capacity
+        self._refill_rate = refill_rate
+        self._tokens = float(capacity)
+        self._stamp = None
+        self._cond = asyncio.Condition()
+
+    def _refill(self, now: float):
+        if self._stamp is not None:
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._stamp) * self._refill_rate
+            )
+        self._stamp = now
+
+    async def acquire(self):
+        async with self._cond:
+            loop = asyncio.get_running_loop()
+            while True:
+                self._refill(loop.time())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._refill_rate)
+
+
+# recipients per DATA transmission when identical bodies are collapsed;
+# conservative enough for the common provider RCPT limits
+_RCPT_CHUNK = 50
+
+
+def _build_message(subject: str, text_body: str, html_body: str):
+    # single-part messages skip the multipart wrapper: ~200 bytes of
+    # boundary/header overhead per message that adds up across a campaign
+    if text_body and html_body:
+        msg = MIMEMultipart("alternative")
+        msg.attach(MIMEText(text_body, "plain"))
+        msg.attach(MIMEText(html_body, "html"))
+    elif html_body:
+        msg = MIMEText(html_body, "html")
+    else:
+        msg = MIMEText(text_body, "plain")
+    # BCC-style broadcast: recipients ride the SMTP envelope, not the headers
+    msg["From"] = SMTP_FROM
+    msg["To"] = "undisclosed-recipients:;"
+    msg["Subject"] = subject
+    return msg
+
+
+def _flatten(subject: str, text_body: str, html_body: str) -> bytes:
+    # straight to wire bytes (SMTP policy: CRLF, 7-bit-safe) so no MIME or
+    # encoding work happens while a connection is held
+    buf = io.BytesIO()
+    BytesGenerator(buf, policy=_SMTP_POLICY).flatten(
+        _build_message(subject, text_body, html_body)
+    )
+    return buf.getvalue()
+
+
+def _prebuild_batch(batch):
+    # template campaigns repeat one body across the batch: collapse identical
+    # bodies into one DATA transmission carrying up to _RCPT_CHUNK envelope
+    # recipients — 3-4 RTTs per distinct body instead of per email. Distinct
+    # bodies degrade gracefully to singleton groups on the same path
+    groups = {}
+    for item in batch:
+        key = (item.subject, item.text_body, item.html_body)
+        groups.setdefault(key, []).append(item.to)
+    prepared = []
+    for (subject, text_body, html_body), recipients in groups.items():
+        raw = _flatten(subject, text_body, html_body)
+        for start in range(0, len(recipients), _RCPT_CHUNK):
+            prepared.append((recipients[start : start + _RCPT_CHUNK], raw))
+    return prepared
+
+
+async def send_email_batch(batch, max_retries, jitter, sent, failed, per_connection=500):
+    # serialize the whole batch on a worker thread first; the connection
+    # spends its time writing to the socket, not flattening MIME trees
+    prepared = await asyncio.to_thread(_prebuild_batch, batch)
+    await _send_prepared(prepared, max_retries, jitter, sent, failed, per_connection)
+
+
+async def _acquire_with_backoff(max_retries, state):
+    # reconnects back off with decorrelated jitter — sleep drawn from
+    # uniform(base, 3 * previous sleep), capped — which converges faster
+    # than full jitter after a server drop while still keeping workers
+    # desynchronized; the window resets on the first success
+    while True:
+        try:
+            client = await _acquire_client()
+        except (aiosmtplib.SMTPException, OSError):
+            if state["attempt"] >= max_retries:
+                raise
+            state["attempt"] += 1
+            state["backoff"] = min(
+                _BACKOFF_CAP, random.uniform(_BACKOFF_BASE, state["backoff"] * 3)
+            )
+            await asyncio.sleep(state["backoff"])
+        else:
+            state["attempt"] = 0
+            state["backoff"] = _BACKOFF_BASE
+            return client
+
+
+async def _send_prepared(prepared, max_retries, jitter, sent, failed, per_connection):
+    # connections come from the shared pre-authenticated pool, so a batch
+    # usually skips the TLS + AUTH handshake; they are recycled every
+    # per_connection sends so a long batch never trips a provider's
+    # per-connection message cap. Every message gets max_retries attempts
+    # with jittered backoff before it counts as failed
+    reconnect_state = {"attempt": 0, "backoff": _BACKOFF_BASE}
+    try:
+        client = await _acquire_with_backoff(max_retries, reconnect_state)
+    except (aiosmtplib.SMTPException, OSError) as exc:
+        failed.extend(
+            {"email": to, "error": str(exc)} for recipients, _ in prepared for to in recipients
+        )
+        return
+    sent_on_conn = 0
+    try:
+        for recipients, raw in prepared:
+            if sent_on_conn >= per_connection:
+                try:
+                    await client.quit()
+                except (aiosmtplib.SMTPException, OSError):
+                    pass
+                try:
+                    client = await _acquire_with_backoff(max_retries, reconnect_state)
+                except (aiosmtplib.SMTPException, OSError) as exc:
+                    failed.extend(
+                        {"email": to, "error": str(exc)} for to in recipients
+                    )
+                    continue
+                sent_on_conn = 0
+            for attempt in range(max_retries + 1):
+                try:
+                    # declare the payload size up front where the server
+                    # advertises SIZE, so oversized mail is refused at MAIL
+                    # FROM instead of after streaming the whole DATA body.
+                    # EHLO itself ran once at connect; aiosmtplib caches the
+                    # feature set on the client, so this probe is a dict hit
+                    mail_options = (
+                        ["SIZE={}".format(len(raw))]
+                        if client.supports_extension("size")
+                        else []
+                    )
+                    # aiosmtplib pipelines the RCPT sequence when the server
+                    # advertises PIPELINING
+                    # partial acceptance comes back in the errors dict —
+                    # sendmail only raises when every recipient is refused
+                    errors, _ = await client.sendmail(
+                        SMTP_FROM, recipients, raw, mail_options=mail_options
+                    )
+                    if errors:
+                        sent.extend(to for to in recipients if to not in errors)
+                        failed.extend(
+                            {"email": to, "error": "recipient refused"}
+                            for to in recipients
+                            if to in errors
+                        )
+                    else:
+                        sent.extend(recipients)
+                    sent_on_conn += len(recipients)
+                    break
+                except aiosmtplib.SMTPRecipientsRefused:
+                    # every recipient in the chunk was refused; nothing was sent
+                    failed.extend(
+                        {"email": to, "error": "recipient refused"}
+                        for to in recipients
+                    )
+                    sent_on_conn += len(recipients)
+                    break
+                except aiosmtplib.SMTPException as exc:
+                    if attempt == max_retries:
+                        failed.extend(
+                            {"email": to, "error": str(exc)} for to in recipients
+                        )
+                    else:
+                        await asyncio.sleep(_backoff(attempt, jitter))
+    finally:
+        # healthy connections go back to the pool for the next batch;
+        # dead ones are quit and dropped inside _release_client
+        await _release_client(client)
+
+
+def _make_bucket(request):
+    if request.delay_between_batches <= 0:
+        return None
+    return TokenBucket(
+        capacity=request.concurrent_connections,
+        refill_rate=request.concurrent_connections / request.delay_between_batches,
+    )
+
+
+async def _dispatch(batches, concurrency, bucket, handler):
+    # a fixed worker set pulling from a bounded queue: in-flight memory is
+    # O(concurrency) instead of one coroutine per batch, and the producer
+    # blocks once the window is full rather than materializing everything
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def _producer():
+        for batch in batches:
+            await queue.put(batch)
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def _worker():
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+            if bucket is not None:
+                await bucket.acquire()
+            await handler(batch)
+
+    await asyncio.gather(_producer(), *[_worker() for _ in range(concurrency)])
+
+
+@router.post("/send-campaign")
+async def send_campaign(request: EmailRequest):
+    emails = request.emails
+    batches = (
+        emails[start : start + request.batch_size]
+        for start in range(0, len(emails), request.batch_size)
+    )
+
+    sent = []
+    failed = _FailureLog(
+        str(request.dead_letter_url) if request.dead_letter_url else None
+    )
+
+    async def _handle(batch):
+        await send_email_batch(
+            batch,
+            request.max_retries,
+            request.jitter,
+            sent,
+            failed,
+            request.emails_per_connection,
+        )
+
+    await _dispatch(
+        batches, request.concurrent_connections, _make_bucket(request), _handle
+    )
+    await failed.flush()
+
+    return {
+        "status": 200,
+        "total": len(emails),
+        "sent_count": len(sent),
+        "failed_count": failed.count,
+        "failed_details": list(failed.sample),
+    }
+
+
+@router.post("/send-campaign-bulk")
+async def send_campaign_bulk(request: BulkEmailRequest):
+    # the body is shared, so it is flattened exactly once; workers iterate
+    # recipient chunks of the flat array — no per-recipient objects anywhere
+    raw = await asyncio.to_thread(
+        _flatten, request.subject, request.text_body, request.html_body
+    )
+    recipients = request.to_emails
+    prepared = (
+        (recipients[start : start + _RCPT_CHUNK], raw)
+        for start in range(0, len(recipients), _RCPT_CHUNK)
+    )
+
+    sent = []
+    failed = _FailureLog(
+        str(request.dead_letter_url) if request.dead_letter_url else None
+    )
+
+    async def _handle(chunk):
+        await _send_prepared(
+            [chunk],
+            request.max_retries,
+            request.jitter,
+            sent,
+            failed,
+            request.emails_per_connection,
+        )
+
+    await _dispatch(
+        prepared, request.concurrent_connections, _make_bucket(request), _handle
+    )
+    await failed.flush()
+
+    return {
+        "status": 200,
+        "total": len(recipients),
+        "sent_count": len(sent),
+        "failed_count": failed.count,
+        "failed_details": list(failed.sample),
+    }
@@ -0,0 +1,69 @@
+import os
+import pickle
+import sys
+
+try:
+    import marisa_trie
+except ImportError:
+    # wheel unavailable on some deploy targets; the frozenset path still works
+    marisa_trie = None
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def load_domains_from_file(filename):
+    # load a one-domain-per-line txt file as a frozenset; a pickled copy is
+    # kept next to it so later startups skip the line-by-line parse unless
+    # the txt file changed. Members are interned so a probe that does land
+    # in a bucket resolves by pointer identity before falling back to a
+    # character compare
+    txt_path = os.path.join(DATA_DIR, filename)
+    pkl_path = txt_path + ".pkl"
+    try:
+        if os.path.getmtime(pkl_path) >= os.path.getmtime(txt_path):
+            with open(pkl_path, "rb") as handle:
+                return frozenset(map(sys.intern, pickle.load(handle)))
+    except (OSError, pickle.UnpicklingError):
+        pass
+
+    with open(txt_path, encoding="utf-8") as handle:
+        domains = frozenset(
+            sys.intern(line.strip().lower()) for line in handle if line.strip()
+        )
+    try:
+        with open(pkl_path, "wb") as handle:
+            pickle.dump(domains, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return domains
+
+
+def load_domain_trie(filename):
+    # marisa trie packs the domain list far tighter than a set of str objects
+    # and mmaps straight from disk, so startups after the first parse nothing
+    if marisa_trie is None:
+        return load_domains_from_file(filename)
+
+    txt_path = os.path.join(DATA_DIR, filename)
+    trie_path = txt_path + ".trie"
+    try:
+        if os.path.getmtime(trie_path) >= os.path.getmtime(txt_path):
+            trie = marisa_trie.Trie()
+            trie.mmap(trie_path)
+            return trie
+    except OSError:
+        pass
+
+    with open(txt_path, encoding="utf-8") as handle:
+        domains = [line.strip().lower() for line in handle if line.strip()]
+    trie = marisa_trie.Trie(domains)
+    try:
+        trie.save(trie_path)
+    except OSError:
+        pass
+    return trie
+
+
+DISPOSABLE_DOMAINS = load_domain_trie("disposable_domains.txt")
+FREE_EMAIL_DOMAINS = load_domains_from_file("free_email_domains.txt")
+SUSPICIOUS_TLDS = load_domains_from_file("suspicious_tlds.txt")
@@ -0,0 +1,192 @@
+import asyncio
+import os
+from email.mime.multipart import MIMEMultipart
+from functools import lru_cache
+from email.mime.text import MIMEText
+from typing import List
+
+import aiosmtplib
+from fastapi import APIRouter, BackgroundTasks
+from pydantic import BaseModel
+
+router = APIRouter()
+
+SMTP_SERVER = os.getenv("SMTP_SERVER", "localhost")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME", "")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
+SMTP_FROM = os.getenv("SMTP_FROM", SMTP_USERNAME)
+
+# concurrent SMTP sessions per request; batches are split across them so
+# wall time is bounded by the slowest session, not the sum of all sends
+_SEND_CONCURRENCY = 4
+
+
+class EmailSchema(BaseModel):
+    to: str
+    subject: str
+    text_body: str = ""
+    html_body: str = ""
+
+
+@lru_cache(maxsize=128)
+def _body_parts(text_body: str, html_body: str):
+    # batches usually repeat one body across every recipient; encode the
+    # MIMEText parts once and reuse them — only the headers vary per message
+    parts = []
+    if text_body:
+        parts.append(MIMEText(text_body, "plain"))
+    if html_body:
+        parts.append(MIMEText(html_body, "html"))
+    return tuple(parts)
+
+
+def _build_group_message(subject, text_body, html_body, recipients):
+    msg = MIMEMultipart("alternative")
+    msg["From"] = SMTP_FROM
+    # recipients ride on the envelope only (same as campaign.py): a BCC-style
+    # header keeps grouped sends from leaking every address to every recipient
+    msg["To"] = "undisclosed-recipients:;"
+    msg["Subject"] = subject
+    for part in _body_parts(text_body, html_body):
+        msg.attach(part)
+    return msg
+
+
+async def _open_client():
+    client = aiosmtplib.SMTP(hostname=SMTP_SERVER, port=SMTP_PORT, timeout=10)
+    await client.connect()
+    if SMTP_USERNAME:
+        await client.login(SMTP_USERNAME, SMTP_PASSWORD)
+    return client
+
+
+# authenticated sessions kept alive between requests so a send doesn't pay
+# the TLS + login handshake; a background NOOP stops the server idling them out
+_NOOP_INTERVAL = 30
+_smtp_pool = asyncio.Queue()
+
+
+async def _acquire_client():
+    while True:
+        try:
+            client = _smtp_pool.get_nowait()
+        except asyncio.QueueEmpty:
+            return await _open_client()
+        if client.is_connected:
+            return client
+        # server dropped this one while idle; discard and try the next
+
+
+async def _release_client(client):
+    if client.is_connected and _smtp_pool.qsize() < _SEND_CONCURRENCY:
+        _smtp_pool.put_nowait(client)
+        return
+    try:
+        await client.quit()
+    except (aiosmtplib.SMTPException, OSError):
+        pass
+
+
+async def _keepalive():
+    while True:
+        await asyncio.sleep(_NOOP_INTERVAL)
+        for _ in range(_smtp_pool.qsize()):
+            try:
+                client = _smtp_pool.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            try:
+                await client.noop()
+                _smtp_pool.put_nowait(client)
+            except (aiosmtplib.SMTPException, OSError):
+                pass
+
+
+@router.on_event("startup")
+async def _warm_smtp_pool():
+    for _ in range(_SEND_CONCURRENCY):
+        try:
+            _smtp_pool.put_nowait(await _open_client())
+        except (aiosmtplib.SMTPException, OSError):
+            # no server reachable yet; clients are opened lazily on demand
+            break
+    asyncio.get_running_loop().create_task(_keepalive())
+
+
+async def _sender_worker(queue, sent, failed):
+    try:
+        client = await _acquire_client()
+    except (aiosmtplib.SMTPException, OSError):
+        # connection never came up; everything left on the queue fails fast
+        while not queue.empty():
+            failed.extend(queue.get_nowait()[3])
+        return
+    try:
+        while True:
+            try:
+                subject, text_body, html_body, recipients = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                msg = _build_group_message(subject, text_body, html_body, recipients)
+                # one MAIL FROM + n RCPT TO + one DATA for the whole group;
+                # partially refused recipients come back in the errors dict
+                # rather than as an exception
+                errors, _ = await client.send_message(
+                    msg, sender=SMTP_FROM, recipients=recipients
+                )
+                if errors:
+                    failed.extend(to for to in recipients if to in errors)
+                    sent.extend(to for to in recipients if to not in errors)
+                else:
+                    sent.extend(recipients)
+            except aiosmtplib.SMTPException:
+                failed.extend(recipients)
+    finally:
+        await _release_client(client)
+
+
+def _group_payload(emails):
+    # recipients sharing a body collapse into one message sent to several
+    # RCPT TOs, so identical DATA payloads cross the wire once per group
+    groups = {}
+    for item in emails:
+        key = (item.subject, item.text_body, item.html_body)
+        groups.setdefault(key, []).append(item.to)
+
+    queue = asyncio.Queue()
+    for (subject, text_body, html_body), recipients in groups.items():
+        queue.put_nowait((subject, text_body, html_body, recipients))
+    return queue
+
+
+async def _drain(queue, sent, failed):
+    workers = min(_SEND_CONCURRENCY, max(1, queue.qsize()))
+    await asyncio.gather(*[_sender_worker(queue, sent, failed) for _ in range(workers)])
+
+
+@router.post("/send-emails")
+async def send_emails(
+    emails: List[EmailSchema],
+    background_tasks: BackgroundTasks,
+    queued: bool = False,
+):
+    queue = _group_payload(emails)
+
+    if queued:
+        # fire-and-forget: the response returns as soon as the batch is
+        # grouped, and delivery runs after the response is flushed
+        background_tasks.add_task(_drain, queue, [], [])
+        return {"status": 202, "queued_count": len(emails)}
+
+    sent = []
+    failed = []
+    await _drain(queue, sent, failed)
+
+    return {
+        "status": 200,
+        "sent_count": len(sent),
+        "failed_count": len(failed),
+        "failed": failed,
+    }
@@ -0,0 +1,142 @@
+"""Fake identity generation with per-locale sample pools.
+
+The /fake_email endpoint in main.py covers the quick English case; this
+router adds locale support and richer fields. Faker's construction and
+provider dispatch are paid once per locale — requests sample pre-generated
+tuples with random.choices instead of calling providers per row.
+"""
+
+import random
+import re
+from functools import lru_cache
+from itertools import count as _counter
+from typing import Optional
+
+from faker import Faker
+from fastapi import APIRouter
+
+router = APIRouter()
+
+_POOL_SIZE = 1000
+# characters stripped when a company name becomes a domain label
+_DOMAIN_JUNK_RE = re.compile(r"[^a-z0-9]")
+# compiled once at import: this runs per request, and precompiling skips
+# re's internal cache probe on the hot path
+_DOMAIN_RE = re.compile(
+    r"^(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}$"
+)
+
+
+def validate_domain(domain: str) -> bool:
+    return bool(_DOMAIN_RE.match(domain))
+
+
+# one callable per local-part format, chosen once per request; the old
+# approach of rendering every variant into a dict and picking one allocated
+# eleven dead strings per row
+_FORMATTERS = {
+    "first.last": lambda first, last, number: "{}.{}".format(first, last),
+    "first_last": lambda first, last, number: "{}_{}".format(first, last),
+    "firstlast": lambda first, last, number: "{}{}".format(first, last),
+    "first": lambda first, last, number: first,
+    "last.first": lambda first, last, number: "{}.{}".format(last, first),
+    "flast": lambda first, last, number: "{}{}".format(first[0], last),
+    "f.last": lambda first, last, number: "{}.{}".format(first[0], last),
+    "firstl": lambda first, last, number: "{}{}".format(first, last[0]),
+    "lastf": lambda first, last, number: "{}{}".format(last, first[0]),
+    "first.last#": lambda first, last, number: "{}.{}{}".format(first, last, number),
+    "firstlast#": lambda first, last, number: "{}{}{}".format(first, last, number),
+    "first#": lambda first, last, number: "{}{}".format(first, number),
+}
+
+
+def generate_email_by_format(format_type, first, last, number):
+    return _FORMATTERS[format_type](first, last, number)
+
+
+@lru_cache(maxsize=16)
+def _pools(locale: str):
+    # Faker(locale) re-initializes every provider (~ms); one instance per
+    # locale lives exactly long enough to fill these tuples
+    fake = Faker(locale)
+    return (
+        tuple(fake.first_name() for _ in range(_POOL_SIZE)),
+        tuple(fake.last_name() for _ in range(_POOL_SIZE)),
+        tuple(fake.company() for _ in range(_POOL_SIZE)),
+        tuple(fake.job() for _ in range(_POOL_SIZE)),
+        tuple(fake.tld() for _ in range(_POOL_SIZE)),
+    )
+
+
+def _company_domain(company: str, tld: str) -> str:
+    return "{}.{}".format(_DOMAIN_JUNK_RE.sub("", company.lower()), tld)
+
+
+@router.get("/generate/fake-email")
+async def generate_fake_email(
+    count: int = 1,
+    locale: str = "en_US",
+    include_name: bool = True,
+    include_company: bool = True,
+    include_job: bool = False,
+    domain: Optional[str] = None,
+    format_type: str = "first.last",
+):
+    count = max(1, min(count, 1000))
+    if domain is not None and not validate_domain(domain):
+        return {"status": 400, "message": "Invalid domain: {}".format(domain)}
+    formatter = _FORMATTERS.get(format_type)
+    if formatter is None:
+        return {
+            "status": 400,
+            "message": "Unknown format_type. Supported: {}".format(
+                ", ".join(_FORMATTERS)
+            ),
+        }
+    try:
+        first_pool, last_pool, company_pool, job_pool, tld_pool = _pools(locale)
+    except (AttributeError, ValueError):
+        return {"status": 400, "message": "Unsupported locale: {}".format(locale)}
+
+    firsts = random.choices(first_pool, k=count)
+    lasts = random.choices(last_pool, k=count)
+    companies = random.choices(company_pool, k=count)
+    jobs = random.choices(job_pool, k=count)
+    tlds = random.choices(tld_pool, k=count)
+
+    if domain is not None:
+        domains = [domain] * count
+    else:
+        domains = [_company_domain(c, t) for c, t in zip(companies, tlds)]
+
+    # collisions get a monotonically increasing suffix — unique on the first
+    # try by construction, never a retry loop
+    seen = set()
+    seq = _counter(1)
+    numbers = random.choices(range(1, 100), k=count)
+    addresses = []
+    for first, last, row_domain, number in zip(firsts, lasts, domains, numbers):
+        local = formatter(first.lower(), last.lower(), number)
+        address = "{}@{}".format(local, row_domain)
+        if address in seen:
+            address = "{}-{}@{}".format(local, next(seq), row_domain)
+        seen.add(address)
+        addresses.append(address)
+
+    results = [{"email": address} for address in addresses]
+    # the include_* branches run once per field instead of once per row;
+    # optional columns are zipped onto the prebuilt rows
+    columns = []
+    if include_name:
+        columns += [("first_name", firsts), ("last_name", lasts)]
+    if include_company:
+        columns.append(("company", companies))
+    if include_job:
+        columns.append(("job_title", jobs))
+    for key, column in columns:
+        for row, value in zip(results, column):
+            row[key] = value
+
+    if count == 1:
+        return results[0]
+    return results
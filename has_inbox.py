@@ -0,0 +1,327 @@
+import asyncio
+import os
+import pickle
+import queue
+import secrets
+import smtplib
+import socket
+import threading
+import time
+from typing import List
+
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+from fastapi import APIRouter
+
+from _email_fast import quick_reject
+
+router = APIRouter()
+
+# one shared async resolver so MX lookups never block the event loop and
+# /etc/resolv.conf is parsed once, not per call. Nameservers stay whatever
+# the host configures — the Dockerfile already points high-QPS setups at a
+# local caching daemon, which beats hardcoding public resolvers here
+_resolver = dns.asyncresolver.Resolver()
+_resolver.timeout = 5
+_resolver.lifetime = 5
+# EDNS with a modern payload size: large MX answers arrive in one UDP
+# datagram instead of truncating and retrying over TCP
+_resolver.use_edns(0, payload=1232)
+
+
+# MX answers cached per domain so bulk traffic hitting the same domains
+# (gmail.com etc.) skips the DNS round trip; entries expire on the record's
+# own TTL, misses are cached briefly so dead domains aren't hammered
+_MX_CACHE_MAX = 50_000
+_NEGATIVE_TTL = 60
+_mx_cache = {}
+
+
+async def get_mx_records(domain: str):
+    # resolve MX records without stalling other requests while DNS is in flight
+    now = time.monotonic()
+    cached = _mx_cache.get(domain)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+
+    try:
+        answers = await _resolver.resolve(domain, "MX")
+    except (
+        dns.resolver.NoAnswer,
+        dns.resolver.NXDOMAIN,
+        # SERVFAIL/refused from every nameserver: routine for dead domains in
+        # bulk lists, so it's a negative-TTL miss, not an error to propagate
+        dns.resolver.NoNameservers,
+        dns.exception.Timeout,
+    ):
+        records = []
+        ttl = _NEGATIVE_TTL
+    else:
+        # sorted by preference so callers probing records[0] hit the primary
+        # exchanger, not whatever order the server answered in
+        records = [
+            str(record.exchange).rstrip(".")
+            for record in sorted(answers, key=lambda r: r.preference)
+        ]
+        ttl = answers.rrset.ttl
+
+    if len(_mx_cache) >= _MX_CACHE_MAX:
+        _mx_cache.clear()
+    _mx_cache[domain] = (records, now + ttl)
+    return records
+
+
+# mail exchangers already seen accepting a random address; a hit skips the
+# second RCPT round trip on later checks. Persisted so restarts keep the
+# knowledge (a plain set — the population is bounded by distinct MX hosts
+# probed, so a bloom filter buys nothing here)
+_CATCH_ALL_CACHE = os.path.join(os.path.dirname(__file__), "data", "catch_all_mxs.pkl")
+try:
+    with open(_CATCH_ALL_CACHE, "rb") as _handle:
+        _known_catch_all = set(pickle.load(_handle))
+except (OSError, pickle.UnpicklingError):
+    _known_catch_all = set()
+
+
+def _remember_catch_all(mx_host: str):
+    _known_catch_all.add(mx_host)
+    try:
+        with open(_CATCH_ALL_CACHE, "wb") as handle:
+            pickle.dump(_known_catch_all, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+
+
+# resolved once at import: smtplib falls back to socket.getfqdn() per
+# connection otherwise, and that reverse-DNS lookup can hang for seconds
+# on misconfigured networks
+LOCAL_HOSTNAME = socket.getfqdn()
+
+
+def open_smtp(mx_host: str):
+    # one connect + HELO; MAIL FROM is issued per probe so pooled sessions
+    # can be RSET back to a clean state between uses
+    server = smtplib.SMTP(timeout=5, local_hostname=LOCAL_HOSTNAME)
+    server.connect(mx_host)
+    server.helo()
+    return server
+
+
+def rcpt(server, email: str):
+    code, _ = server.rcpt(email)
+    return code
+
+
+# long-lived sessions per mail exchanger: repeat probes against the same MX
+# (the normal bulk shape) skip the TCP + HELO handshake and just run another
+# MAIL/RCPT/RSET cycle. Capped per host to stay inside provider limits
+_POOL_MAX_PER_HOST = 5
+_smtp_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(mx_host: str):
+    with _pools_lock:
+        pool = _smtp_pools.get(mx_host)
+        if pool is None:
+            pool = _smtp_pools[mx_host] = queue.SimpleQueue()
+        return pool
+
+
+def _acquire_smtp(mx_host: str):
+    pool = _get_pool(mx_host)
+    while True:
+        try:
+            server = pool.get_nowait()
+        except queue.Empty:
+            return open_smtp(mx_host)
+        try:
+            server.noop()
+            return server
+        except (smtplib.SMTPException, OSError):
+            # idled out while pooled; discard and try the next one
+            try:
+                server.close()
+            except OSError:
+                pass
+
+
+def _release_smtp(mx_host: str, server):
+    pool = _get_pool(mx_host)
+    if pool.qsize() < _POOL_MAX_PER_HOST:
+        pool.put_nowait(server)
+        return
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        pass
+
+
+def _probe_rcpts(mx_host: str, addresses):
+    # one pooled session runs a MAIL FROM, the RCPT probes, then RSET so the
+    # connection goes back clean; a failed probe discards the connection
+    server = _acquire_smtp(mx_host)
+    try:
+        server.mail("probe@example.com")
+        codes = [rcpt(server, addr) for addr in addresses]
+        server.rset()
+    except (smtplib.SMTPException, OSError):
+        try:
+            server.close()
+        except OSError:
+            pass
+        raise
+    _release_smtp(mx_host, server)
+    return codes
+
+
+def check_smtp_connection(mx_host: str, email: str):
+    # probe a single address with RCPT TO against the given mail exchanger
+    return _probe_rcpts(mx_host, [email])[0]
+
+
+def probe_inbox(mx_host: str, email: str, probe_addr: str):
+    # real-address and catch-all probes share one session and one MAIL FROM
+    code, catch_all_code = _probe_rcpts(mx_host, [email, probe_addr])
+    return code, catch_all_code
+
+
+@router.post("/has-inbox")
+async def check_has_inbox(email: str):
+    if quick_reject(email):
+        return {
+            "email": email,
+            "has_inbox": False,
+            "message": "Invalid email address.",
+        }
+    # one rpartition pass instead of split + lower on every use
+    domain = email.rpartition("@")[2].lower()
+    mx_records = await get_mx_records(domain)
+    if not mx_records:
+        return {
+            "email": email,
+            "has_inbox": False,
+            "message": "No mail server found for the domain.",
+        }
+    return {"email": email, "has_inbox": True, "mx_records": mx_records}
+
+
+# bounds for the bulk endpoint: concurrent domains being probed, and RCPTs
+# issued per MAIL/RSET cycle so one session never front-loads a huge batch
+_BULK_PROBE_CONCURRENCY = 20
+_BULK_RCPT_CHUNK = 50
+
+
+@router.post("/inbox-status-bulk")
+async def get_inbox_status_bulk(emails: List[str]):
+    # group by domain so each domain pays one MX lookup and its addresses
+    # share pooled SMTP sessions: N probes against one exchanger become
+    # MAIL + N RCPTs instead of N full handshakes
+    verdicts = {}
+    by_domain = {}
+    seen = set()
+    for email in emails:
+        if email in seen:
+            continue
+        seen.add(email)
+        if quick_reject(email):
+            verdicts[email] = {
+                "email": email,
+                "status": False,
+                "message": "Invalid email address.",
+            }
+            continue
+        by_domain.setdefault(email.rpartition("@")[2].lower(), []).append(email)
+
+    semaphore = asyncio.Semaphore(_BULK_PROBE_CONCURRENCY)
+
+    def _probe_domain_batch(mx_host, addresses, probe):
+        # one or more MAIL/RCPT/RSET cycles on pooled sessions; the random
+        # probe address rides in the first chunk to detect catch-all once
+        batch = ([probe] if probe else []) + addresses
+        codes = []
+        for start in range(0, len(batch), _BULK_RCPT_CHUNK):
+            codes.extend(_probe_rcpts(mx_host, batch[start : start + _BULK_RCPT_CHUNK]))
+        if probe:
+            return codes[0], codes[1:]
+        return None, codes
+
+    async def _probe_domain(domain, addresses):
+        async with semaphore:
+            mx_records = await get_mx_records(domain)
+            if not mx_records:
+                for email in addresses:
+                    verdicts[email] = {
+                        "email": email,
+                        "status": False,
+                        "message": "No mail server found for the domain.",
+                    }
+                return
+            mx_host = mx_records[0]
+            known = mx_host in _known_catch_all
+            probe = None if known else "probe-{}@{}".format(secrets.token_hex(8), domain)
+            try:
+                catch_all_code, codes = await asyncio.to_thread(
+                    _probe_domain_batch, mx_host, addresses, probe
+                )
+            except (smtplib.SMTPException, OSError):
+                for email in addresses:
+                    verdicts[email] = {
+                        "email": email,
+                        "status": False,
+                        "message": "SMTP connection failed.",
+                    }
+                return
+            is_catch_all = known or catch_all_code in (250, 251)
+            if is_catch_all and not known:
+                _remember_catch_all(mx_host)
+            for email, code in zip(addresses, codes):
+                verdicts[email] = {
+                    "email": email,
+                    "status": code in (250, 251),
+                    "is_catch_all": is_catch_all,
+                }
+
+    await asyncio.gather(
+        *[_probe_domain(domain, addresses) for domain, addresses in by_domain.items()]
+    )
+    return [verdicts[email] for email in emails]
+
+
+@router.post("/inbox-status")
+async def get_inbox_status(email: str):
+    if quick_reject(email):
+        return {"email": email, "status": False, "message": "Invalid email address."}
+    domain = email.rpartition("@")[2].lower()
+    mx_records = await get_mx_records(domain)
+    if not mx_records:
+        return {
+            "email": email,
+            "status": False,
+            "message": "No mail server found for the domain.",
+        }
+
+    mx_host = mx_records[0]
+    try:
+        if mx_host in _known_catch_all:
+            # known catch-all server: the random-address probe is a foregone
+            # conclusion, so spend only one RCPT on the real address
+            code = await asyncio.to_thread(check_smtp_connection, mx_host, email)
+            catch_all_code = 250
+        else:
+            # a random address alongside the real one detects catch-all
+            # servers; token_hex skips the UUID constructor's bit-fiddling —
+            # the probe only needs to not exist, not to be a v4 UUID
+            probe = "probe-{}@{}".format(secrets.token_hex(8), domain)
+            code, catch_all_code = await asyncio.to_thread(
+                probe_inbox, mx_host, email, probe
+            )
+    except (smtplib.SMTPException, OSError):
+        return {"email": email, "status": False, "message": "SMTP connection failed."}
+
+    deliverable = code in (250, 251)
+    is_catch_all = deliverable and catch_all_code in (250, 251)
+    if is_catch_all and mx_host not in _known_catch_all:
+        _remember_catch_all(mx_host)
+    return {"email": email, "status": deliverable, "is_catch_all": is_catch_all}
@@ -0,0 +1,386 @@
+"""Richer inbox-status validation than the bare MX probe in has_inbox.
+
+Endpoints here classify an address (syntax, role accounts, domain
+reputation, deliverability) and are built for bulk traffic: every stage
+either answers from in-process state or fans out concurrently.
+"""
+
+import asyncio
+import math
+import os
+import pickle
+import re
+from collections import Counter
+from functools import lru_cache
+
+from cachetools import TTLCache
+from fastapi import APIRouter
+from pydantic import BaseModel, Field
+
+from _email_fast import _scan_email, scan_many
+from config import DATA_DIR, DISPOSABLE_DOMAINS, FREE_EMAIL_DOMAINS, SUSPICIOUS_TLDS
+from has_inbox import get_mx_records
+
+try:
+    from rapidfuzz import fuzz, process as _fuzz_process
+except ImportError:
+    # typo detection degrades to exact matching where the wheel is missing
+    _fuzz_process = None
+
+try:
+    import gender_guesser.detector as _gender_module
+
+    _gender_detector = _gender_module.Detector(case_sensitive=False)
+except ImportError:
+    _gender_detector = None
+
+router = APIRouter()
+
+# reachability verdicts are stable for minutes; cache them per domain and
+# let the per-key lock single-flight concurrent probes of the same domain
+_HTTP_CACHE = TTLCache(maxsize=10_000, ttl=600)
+_HTTP_LOCKS = {}
+
+_TCP_TIMEOUT = 3
+
+
+async def _cached(cache, locks, key, factory):
+    value = cache.get(key)
+    if value is not None:
+        return value
+    lock = locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        value = cache.get(key)
+        if value is None:
+            value = await factory()
+            cache[key] = value
+        locks.pop(key, None)
+    return value
+
+
+async def _probe_tcp(domain: str) -> bool:
+    # a completed TCP handshake on 443 is the signal; the verdict only feeds
+    # a liveness heuristic, so skipping TLS and the HTTP exchange saves
+    # ~3 RTTs plus handshake CPU on every probe
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(domain, 443), _TCP_TIMEOUT
+        )
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    return True
+
+
+async def check_tcp_reachable(domain: str) -> bool:
+    return await _cached(
+        _HTTP_CACHE, _HTTP_LOCKS, domain, lambda: _probe_tcp(domain)
+    )
+
+# compiled once with re.ASCII: email syntax here is byte-oriented, and the
+# ASCII flag keeps the engine off the Unicode property tables entirely
+EMAIL_REGEX = re.compile(
+    r"[a-zA-Z0-9._%+-]{1,64}@[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?"
+    r"(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*\.[a-zA-Z]{2,}",
+    re.ASCII,
+)
+
+# local parts that address a function, not a person; campaigns usually want
+# these flagged because they bounce or go to shared queues
+ROLE_BASED_PREFIXES = frozenset(
+    {
+        "abuse",
+        "admin",
+        "billing",
+        "careers",
+        "contact",
+        "dev",
+        "enquiries",
+        "feedback",
+        "finance",
+        "hello",
+        "help",
+        "hr",
+        "info",
+        "inquiry",
+        "it",
+        "jobs",
+        "legal",
+        "mail",
+        "marketing",
+        "media",
+        "newsletter",
+        "noreply",
+        "no-reply",
+        "office",
+        "orders",
+        "postmaster",
+        "press",
+        "privacy",
+        "sales",
+        "security",
+        "service",
+        "support",
+        "team",
+        "webmaster",
+    }
+)
+
+# bound on concurrent in-flight checks for the bulk endpoint
+_BULK_CONCURRENCY = 50
+
+# domains considered canonical when hunting for typos (gmial.com -> gmail.com)
+WELL_EMAIL_DOMAINS = FREE_EMAIL_DOMAINS
+# materialized once — extractOne wants a sequence, and rebuilding the list
+# per call would cost more than the scan itself
+_TRUSTED_DOMAINS_LIST = sorted(WELL_EMAIL_DOMAINS)
+# below this similarity a domain is just different, not a typo; the cutoff
+# also lets rapidfuzz abandon candidates early inside the C scorer
+_TYPO_SCORE_CUTOFF = 86
+
+
+def _calculate_entropy(text: str) -> float:
+    # single Counter pass plus log2 per unique character, using
+    # H = log2(n) - (1/n) * sum(c * log2(c)) to keep division out of the loop
+    n = len(text)
+    if n == 0:
+        return 0.0
+    log2 = math.log2
+    return log2(n) - sum(c * log2(c) for c in Counter(text).values()) / n
+
+
+_VOWELS = frozenset("aeiou")
+
+
+@lru_cache(maxsize=10_000)
+def detect_gibberish(local_part: str) -> bool:
+    # keyboard mash shows up as high character entropy, long consonant runs
+    # or a digit-heavy local part; real names stay under all three bars
+    if len(local_part) >= 8 and _calculate_entropy(local_part) > 3.5:
+        return True
+    run = 0
+    digits = 0
+    for ch in local_part:
+        if "0" <= ch <= "9":
+            digits += 1
+        if ch.isalpha() and ch not in _VOWELS:
+            run += 1
+            if run >= 5:
+                return True
+        else:
+            run = 0
+    return len(local_part) > 6 and 2 * digits > len(local_part)
+
+
+# flat lowercase-name -> gender dict, persisted beside the other caches in
+# data/: one dict hit per lookup instead of the library's per-call
+# case-folding and country-table walk, and later cold starts skip the build
+_NAMES_CACHE = os.path.join(DATA_DIR, "names.pkl")
+
+
+def _load_name_map():
+    try:
+        with open(_NAMES_CACHE, "rb") as handle:
+            return pickle.load(handle)
+    except (OSError, pickle.UnpicklingError):
+        pass
+    if _gender_detector is None:
+        return {}
+    name_map = {
+        name.lower(): _gender_detector.get_gender(name)
+        for name in _gender_detector.names
+    }
+    try:
+        with open(_NAMES_CACHE, "wb") as handle:
+            pickle.dump(name_map, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return name_map
+
+
+_NAME_MAP = _load_name_map()
+
+_NAME_DELIMS = frozenset("._0123456789-")
+
+
+def _first_name_token(local_part: str) -> str:
+    # manual scan instead of re.split: the regex engine would tokenize the
+    # whole string and allocate a list when only the first token matters
+    end = 0
+    for ch in local_part:
+        if ch in _NAME_DELIMS:
+            break
+        end += 1
+    return local_part[:end]
+
+
+@lru_cache(maxsize=10_000)
+def _demographics(local_part: str):
+    # tuples cache safely; the dict wrapper below hands each caller a fresh
+    # object so cached state never leaks into a mutable response
+    clean_name = _first_name_token(local_part)
+    if not clean_name:
+        return None, "unknown"
+    return clean_name, _NAME_MAP.get(clean_name, "unknown")
+
+
+def infer_demographics(local_part: str):
+    first_name, gender = _demographics(local_part)
+    return {"first_name": first_name, "gender": gender}
+
+
+@lru_cache(maxsize=10_000)
+def detect_domain_typo(domain: str):
+    if domain in WELL_EMAIL_DOMAINS:
+        # exact hit on a canonical domain is the common case: no fuzzy scan
+        return False, None
+    if _fuzz_process is None:
+        return False, None
+    match = _fuzz_process.extractOne(
+        domain,
+        _TRUSTED_DOMAINS_LIST,
+        scorer=fuzz.ratio,
+        score_cutoff=_TYPO_SCORE_CUTOFF,
+    )
+    if match is None:
+        return False, None
+    return True, match[0]
+
+
+def is_valid_syntax(email: str):
+    valid, error, _ = _scan_email(email)
+    return valid, error
+
+
+# anchored alternation built once, longest-first so "no-reply" wins over "no";
+# a role local part is a prefix followed by end-of-string or a separator/digit
+_ROLE_REGEX = re.compile(
+    r"^(?:"
+    + "|".join(
+        re.escape(prefix)
+        for prefix in sorted(ROLE_BASED_PREFIXES, key=len, reverse=True)
+    )
+    + r")(?:$|[._0-9-])",
+    re.ASCII,
+)
+
+
+def is_role_based_email(local_part: str) -> bool:
+    # exact hit is the overwhelmingly common case: one hash probe
+    if local_part in ROLE_BASED_PREFIXES:
+        return True
+    return _ROLE_REGEX.match(local_part) is not None
+
+
+def _is_risky_domain(domain: str) -> bool:
+    # set lookups, no I/O: a disposable provider or throwaway TLD settles the
+    # verdict before any DNS or HTTP round trip is spent on the domain
+    return domain in DISPOSABLE_DOMAINS or domain.rpartition(".")[2] in SUSPICIOUS_TLDS
+
+
+class BulkInboxRequest(BaseModel):
+    emails: list[str] = Field(max_length=10_000)
+
+
+async def _fetch_domain_state(domain: str):
+    # MX and reachability probes are independent; resolve them together
+    mx_records, website_live = await asyncio.gather(
+        get_mx_records(domain), check_tcp_reachable(domain)
+    )
+    return mx_records, website_live
+
+
+async def validate_inbox_status_single(email: str, domain_state=None, scan=None):
+    email = email.strip().lower()
+    # the scanner already found the @ while validating; slice on its position
+    # instead of re-scanning with rpartition. The bulk path scans whole
+    # batches up front through scan_many and hands each result in
+    valid, error, at = _scan_email(email) if scan is None else scan
+    if not valid:
+        return {"email": email, "status": "invalid", "reason": error}
+
+    local_part = email[:at]
+    domain = email[at + 1 :]
+    result = {
+        "email": email,
+        "role_based": is_role_based_email(local_part),
+    }
+
+    if _is_risky_domain(domain):
+        result["status"] = "undeliverable"
+        result["reason"] = "disposable or high-risk domain"
+        return result
+
+    # the bulk path prefetches per-domain state once and hands it in
+    if domain_state is None:
+        domain_state = await _fetch_domain_state(domain)
+    mx_records, website_live = domain_state
+    if not mx_records:
+        result["status"] = "undeliverable"
+        result["reason"] = "no mail server found"
+        # a typo'd provider domain is exactly the undeliverable case worth
+        # explaining, so the suggestion stays; gibberish and demographics
+        # analysis is wasted work on an address that can't receive mail
+        is_typo, suggestion = detect_domain_typo(domain)
+        if is_typo:
+            result["suspected_typo"] = True
+            result["suggested_domain"] = suggestion
+        return result
+
+    result["status"] = "deliverable"
+    result["mx_records"] = mx_records
+    result["website_live"] = website_live
+    is_typo, suggestion = detect_domain_typo(domain)
+    if is_typo:
+        result["suspected_typo"] = True
+        result["suggested_domain"] = suggestion
+    result["gibberish"] = detect_gibberish(local_part)
+    result["demographics"] = infer_demographics(local_part)
+    return result
+
+
+@router.post("/validate/inbox-status")
+async def get_inbox_status_single(email: str):
+    return await validate_inbox_status_single(email)
+
+
+@router.post("/validate/inbox-status-bulk")
+async def get_inbox_status_bulk(request: BulkInboxRequest):
+    # normalize and split each address exactly once; the domain rides along
+    # as a parallel list instead of being re-derived per phase
+    normalized = [email.strip().lower() for email in request.emails]
+    email_domains = [
+        email.rpartition("@")[2] if "@" in email else "" for email in normalized
+    ]
+    # one interpreter crossing for the whole batch instead of one per row
+    scans = scan_many(normalized)
+
+    # phase 1: network work is per unique domain, not per email — a batch of
+    # hundreds of addresses at one provider fetches MX + website state once
+    semaphore = asyncio.Semaphore(_BULK_CONCURRENCY)
+
+    async def _fetch(domain):
+        async with semaphore:
+            return domain, await _fetch_domain_state(domain)
+
+    states = dict(
+        await asyncio.gather(
+            *[
+                _fetch(domain)
+                for domain in set(email_domains)
+                if domain and not _is_risky_domain(domain)
+            ]
+        )
+    )
+
+    # phase 2: uploaded lists repeat addresses; each unique one is classified
+    # once off the prefetched state and the verdicts fan back out in input
+    # order, so duplicates cost a dict hit instead of a full pass
+    verdicts = {}
+    for email, domain, scan in zip(normalized, email_domains, scans):
+        if email not in verdicts:
+            verdicts[email] = await validate_inbox_status_single(
+                email, states.get(domain), scan
+            )
+    results = [verdicts[email] for email in normalized]
+    return {"total": len(results), "results": results}
@@ -1,273 +1,137 @@
-import dns.resolver
+import asyncio
+
 from fastapi import FastAPI, File, UploadFile
-import re, csv, os, shutil, uuid, zipfile, openpyxl, io
+from fastapi.responses import ORJSONResponse
+from typing import List
+import re, csv, os, random, secrets, shutil, uuid, zipfile, io
+from itertools import islice
 from email_validator import validate_email, EmailSyntaxError, EmailNotValidError
-import smtplib, requests
+import httpx
+from cachetools import TTLCache
 from faker import Faker
 
-app = FastAPI()
+from _email_fast import (
+    has_temp_username,
+    is_disposable_domain,
+    is_free_domain,
+    is_service_local,
+    is_temp_domain,
+    quick_reject,
+)
+from bulk_validate import router as bulk_validate_router
+from campaign import router as campaign_router
+from email_sender import router as email_sender_router
+from fake_email import router as fake_email_router
+from has_inbox import get_mx_records, router as has_inbox_router
+from inbox_status import router as inbox_status_router
+
+# orjson serializes the large list-of-dict payloads the bulk endpoints
+# return several times faster than the stdlib encoder, with no per-route
+# changes needed
+app = FastAPI(default_response_class=ORJSONResponse)
+app.include_router(has_inbox_router)
+app.include_router(inbox_status_router)
+app.include_router(bulk_validate_router)
+app.include_router(campaign_router)
+app.include_router(email_sender_router)
+app.include_router(fake_email_router)
 fake = Faker()
 
+# one pooled async client for the domain liveness probes: keep-alive amortizes
+# the TCP+TLS handshake across checks, and awaiting it keeps the event loop
+# free while the probe is in flight
+ASYNC_HTTP = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+    timeout=3.0,
+    # apex domains routinely 301 to www.; liveness means the redirect chain
+    # ends in a 2xx, matching what requests.get did before the migration
+    follow_redirects=True,
+)
+
+
+@app.on_event("shutdown")
+async def _close_http_client():
+    await ASYNC_HTTP.aclose()
+
+
+# liveness verdicts cached per domain: bulk traffic clusters on a handful of
+# popular providers, so most checks skip the outbound HTTPS round trip
+_LIVENESS_CACHE = TTLCache(maxsize=10_000, ttl=3600)
+
+
+async def _domain_is_live(domain: str) -> bool:
+    cached = _LIVENESS_CACHE.get(domain)
+    if cached is not None:
+        return cached
+    try:
+        response = await ASYNC_HTTP.get(f"https://{domain}")
+        live = response.status_code in range(200, 300)
+    except httpx.HTTPError:
+        live = False
+    _LIVENESS_CACHE[domain] = live
+    return live
+
 
 @app.get("/")
 def index():
     return {"message": "welcome to email validation service"}
 
 
+def _domain_of(email: str):
+    # single C-level pass; no intermediate list like split and no regex
+    _, sep, domain = email.rpartition("@")
+    return domain.lower() if sep else ""
+
+
+
+
 @app.post("/check-temp-email")
-async def check_temp_email(email: str):
-    temp_domains = [
-        "guerrillamail",
-        "mitigado",
-        "lyft",
-        "finews.biz",
-        "afia.pro",
-        "brand-app.biz",
-        "clout.wiki",
-        "mailinator",
-        "sharklasers",
-        "getnada",
-        "temp-mail",
-        "tempmail",
-        "cyclesat",
-        "10minutemail",
-        "temp-mail",
-        "yopmail",
-        "mailcatch",
-        "jetable",
-        "throwawaymail",
-        "fakeinbox",
-        "sharklasers",
-        "guerrillamailblock",
-        "guerrillamail",
-        "guerrillamail",
-        "spamgourmet",
-        "mailsucker",
-        "getairmail",
-        "mailnesia",
-        "dispostable",
-        "maildrop",
-        "mailnesia",
-        "emlses",
-        "trashmail",
-        "mailinator",
-        "binkmail",
-        "guerrillamail",
-        "guerrillamail",
-        "guerrillamail",
-        "spam4",
-        "trashmail",
-        "gettempmail",
-        "incognitomail",
-        "tempmailgen",
-        "tempmailo",
-        "trashmail" "trashmail",
-        "mailnesia",
-        "mytemp",
-        "temp-mail",
-        "throwawaymail",
-        "trash-mail",
-        "yopmail",
-        "grr",
-        "inboxalias",
-        "getonemail",
-        "tempmail",
-        "yopmail",
-        "yopmail",
-        "mintemail",
-        "easytrashmail",
-        "trashmail",
-        "33mail",
-        "anonymousemail",
-        "discard",
-        "dispostable",
-        "dodgeit",
-        "emailfake",
-        "emailondeck",
-        "emlhub",
-        "fakeinbox",
-        "fakemailgenerator",
-        "guerrillamail",
-        "guerrillamail",
-        "mailinator2",
-        "mohmal",
-        "mytrashmail",
-        "one-time",
-        "owlymail",
-        "recyclemail",
-        "sendtrash",
-        "spamgourmet",
-        "spaml",
-        "tempemail",
-        "tempemail",
-        "tempmail",
-        "tempmail",
-        "tempmail2",
-        "tempmailer",
-        "tempomail",
-        "throwawaymailclub",
-        "trash-me",
-        "vasya",
-        "20mail",
-        "fghmail",
-        "gtrcincc",
-        "guerillamail",
-        "guerillamail",
-        "guerillamail",
-        "guerillamail",
-        "guerillamailblock",
-        "guerrillamail",
-        "guerrillamail",
-        "guerrillamail",
-        "guerrillamail",
-        "guerrillamail",
-        "guerrillamail",
-        "guerrillamailblock",
-        "h8s",
-        "harakirimail",
-        "hartbot",
-        "ihateyoualot",
-        "inbax",
-        "inbox",
-        "inboxalias",
-        "inboxclean",
-        "inboxproxy",
-        "incognitomail",
-        "jetable",
-        "jetable",
-        "jetable",
-        "jetable",
-        "jnxjn",
-        "kasmail",
-        "keemail",
-        "killmail",
-        "klzlk",
-        "kulturbetrieb",
-        "zimages",
-        "mail4trash",
-        "mailcatch",
-        "maileater",
-        "mailexpire",
-        "mailinator",
-        "mailinator",
-        "mailinator",
-        "mailnesia",
-        "mailsucker",
-        "mailtemp",
-        "mailzilla",
-        "mytrashmail",
-        "netmails",
-        "nomail.xl.cx",
-        "nospam.ze.tc",
-        "onewaymail",
-        "pjjkp",
-        "plhk",
-        "pookmail",
-        "privacy",
-        "proxymail",
-        "qq",
-        "quickinbox",
-        "rejectmail",
-        "rtrtr",
-        "safetymail",
-        "scootmail",
-        "sharklasers",
-        "shiftmail",
-        "shieldedmail",
-        "shortmail",
-        "smailpro",
-        "sneakemail",
-        "snkmail",
-        "sogetthis",
-        "soodonims",
-        "spam4",
-        "spamavert",
-        "spambob",
-        "spambog",
-        "spambog",
-        "spambog",
-        "spambox",
-        "spambox",
-        "irishspringrealty",
-        "spamcannon",
-        "spamcannon",
-        "spamcorptastic",
-        "spamcowboy",
-        "spamcowboy",
-        "spamcowboy",
-        "spamday",
-        "spamex",
-        "spamfree24",
-        "spamfree24",
-        "spamfree24",
-        "spamfree24",
-        "spamfree24",
-        "spamfree24",
-        "spamgourmet",
-        "spamherelots",
-        "spamhereplease",
-        "spamhole",
-        "spamify",
-        "spaml",
-    ]
-    temp_mail_pattern = "^(?i)([a-z0-9._%+-]+@(?:10mail\.org|20mail\.eu|20mail\.it|33mail\.com|anonymail\.info|bcaoo\.com|bccto\.me|brefmail\.com|burnermail\.io|byom\.de|clrmail\.net|coepoe\.com|cool.fr\.nf|correo\.plus|cosmorph\.com|cust.in|dayrep\.com|deadaddress\.com|discard\.email|discardmail\.com|disposableemailaddresses\.com|dispostable\.com|dodgeit\.com|dump-email\.info|dumpmail\.de|email-fake\.com|emailfake\.com|emailondeck\.com|emailsensei\.com|emailtemporanea\.org|emailtemporario\.com\.br|emailthe\.de|emlhub\.com|fakeinbox\.com|fakemail\.net|fast-mail\.org|filzmail\.com|fivemail\.net|fleckens\.hu|getonemail\.com|gettempmail\.com|giantmail\.dk|guerrillamail\.biz|guerrillamail\.com|guerrillamail\.de|guerrillamail\.net|guerrillamail\.org|hatespam\.org|hidemail\.de|hmamail\.com|hochsitze\.com|hotpop\.com|ieh-mail\.de|imails\.info|incognitomail\.org|inbox\.lv|inbox\.lt|inbox\.ru|incognitomail\.com|instant-mail\.org|ipoo\.org|irish2me\.com|jetable\.org|jnxjn\.com|jourrapide\.com|kasmail\.com|keepmymail\.com|killmail\.net|klzlk\.com|koszmail\.pl|kurzepost\.de|letthemeatspam\.com|link2mail\.net|litedrop\.com|mail4trash\.com|mail666\.in|maildrop\.cc|maileater\.net|mailexpire\.com|mailimate\.com|mailinater\.com|mailinator\.com|mailinator2\.com|mailismagic\.com|mailme24\.com|mailnesia\.com|mailnull\.com|mailshell\.com|mailsiphon\.com|mailtemp\.de|mailtemporaire\.com|mailtome\.de|mailtrash\.net|mailzilla\.org|mega.zik.dj|meinspamschutz\.de|meltmail\.com|mierdamail\.com|ministry-of-silly-walks\.de|mintemail\.com|mohmal\.com|moncourrier\.fr\.n|mt2014\.com|mx0\.mailslite\.com|mytempemail\.com|nepwk\.com|no-spam\.at|no-spam\.ch|no-spam\.info|no-spam\.it|no-spam\.jp|no-spam\.nl|noblepioneer\.com|nomail\.2nn\.ru|nomail\.xyz|nospamfor\.us|nospamthanks\.info|notmailinator\.com|nowhere\.org|nurfuerspam\.de|objectmail\.com|obobbo\."
-    local, domain = email.split("@")
-    if domain in temp_mail_pattern:
+async def check_temp_email(email: str, deep_check: bool = False):
+    if quick_reject(email):
         return {"email": email, "temp_email": True}
 
+    local, _, domain = email.rpartition("@")
+
     # Check if the local part contains a common temporary email username pattern
-    temp_usernames = [
-        "temp",
-        "test",
-        "demo",
-        "trial",
-        "sample",
-        "debug",
-        "prototype",
-        "experiment",
-        "sandbox",
-        "beta",
-        "guest",
-        "fakeuser",
-        "user",
-        "fake_user",
-        "junk",
-        "disposable",
-        "anonymous",
-        "user123",
-        "example",
-        "trash",
-    ]
-    for temp_username in temp_usernames:
-        if temp_username in local.lower():
-            return {"email": email, "temp_email": True}
+    if has_temp_username(local.lower()):
+        return {"email": email, "temp_email": True}
 
     # Check if the domain is a temporary email domain
-    for temp_domain in temp_domains:
-        if temp_domain in domain:
-            return {"email": email, "email": email, "temp_email": True}
+    if is_temp_domain(domain.lower()):
+        return {"email": email, "temp_email": True}
+
+    # name and domain both came back clean; the liveness probe is a whole
+    # HTTPS round trip, so it only runs when the caller asks for it
+    if not deep_check:
+        return {"email": email, "temp_email": False}
 
     # check if a domain is live
-    split_email = email.split("@")
+    return {"email": email, "temp_email": not await _domain_is_live(domain)}
 
-    try:
-        response = requests.get(f"https://{split_email[1]}")
 
-        if response.status_code in range(200, 300):
-            return {"email": email, "temp_email": False}
-        else:
-            return {"email": email, "email": email, "temp_email": True}
-    except requests.exceptions.RequestException as e:
-        return {"email": email, "email": email, "temp_email": True}
+try:
+    # RE2 evaluates these as a linear-time DFA: the email pattern can't
+    # backtrack on adversarial input and the 23-way service alternation is
+    # checked in a single pass
+    import re2 as _regex
+except ImportError:
+    # wheel unavailable on some deploy targets; plain re keeps working
+    _regex = re
 
-    return {"email": email, "temp_email": False}
+# compiled once at import; re's internal cache still pays a hash + lookup on
+# every re.match(...) call with a string pattern
+_EMAIL_RE = _regex.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+_BULK_EMAIL_RE = _regex.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
 
 
 @app.post("/check-valid-email")
 def check_valid_email(email: str):
+    if quick_reject(email):
+        return {"email": email, "valid": False, "error": "Invalid email syntax."}
     try:
-        email_regex = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        if re.match(email_regex, email) and validate_email(email):
+        # shape only here; MX/deliverability has its own endpoint and would
+        # be a hidden DNS round trip inside a sync handler
+        if _EMAIL_RE.match(email) and validate_email(email, check_deliverability=False):
             return {"email": email, "valid": True}
         else:
             return {"email": email, "valid": False, "error": "Invalid email syntax."}
@@ -278,20 +142,38 @@ def check_valid_email(email: str):
 
 
 @app.post("/check-email-mx-records")
-def check_email_mx_records(email: str):
-    domain = email.split("@")[1]
-    try:
-        mx_records = dns.resolver.query(domain, "MX")
-        # Validate the email address
-        mx_data = validate_email(email)
-        return {"message": "MX records exists.", "status": True, "mx_data": mx_data}
-    except dns.resolver.NXDOMAIN:
-        return {"message": "Domain does not exist.", "status": False}
-    except dns.resolver.NoAnswer:
+async def check_email_mx_records(email: str):
+    if quick_reject(email):
+        return {"message": "Invalid email address.", "status": False}
+    domain = _domain_of(email)
+    # awaited MX lookup through the shared async resolver, so the event loop
+    # keeps serving other requests while DNS is in flight
+    mx_records = await get_mx_records(domain)
+    if not mx_records:
         return {
             "message": "No valid mail server found for the domain.",
             "status": False,
         }
+    return {"message": "MX records exists.", "status": True, "mx_records": mx_records}
+
+
+@app.post("/check-email-mx-records/batch")
+async def check_email_mx_records_batch(emails: List[str]):
+    # one query per unique domain, fired concurrently under a semaphore; DNS
+    # here is wait-dominated, so throughput comes from in-flight queries
+    domains = {_domain_of(e) for e in emails}
+    domains.discard("")
+    semaphore = asyncio.Semaphore(1024)
+
+    async def _mx_one(domain):
+        async with semaphore:
+            return domain, await get_mx_records(domain)
+
+    resolved = dict(await asyncio.gather(*(_mx_one(d) for d in domains)))
+    return [
+        {"email": e, "status": bool(resolved.get(_domain_of(e)))}
+        for e in emails
+    ]
 
 
 # @app.post("/check-email-account-exists")
@@ -317,12 +199,12 @@ def check_email_mx_records(email: str):
 
 @app.post("/validate-email-by-service")
 def validate_email_by_service(email: str):
+    if quick_reject(email):
+        return {"status": 400, "message": "Invalid email address."}
     try:
-        # Define the regular expression pattern for service emails
-        pattern = r"^(no-reply|no-spam|no_reply|no_spam|support|info|admin|billing|sales|help|contact|customerservice|feedback|newsletter|marketing|media|press|privacy|security|service|subscribe|unsubscribe|webmaster)\@"
-
-        # Use the re module to match the pattern against the email address
-        if re.match(pattern, email):
+        # Check the local part against the known service mailbox names
+        local, sep, _ = email.partition("@")
+        if sep and is_service_local(local):
             return {
                 "status": 200,
                 "message": "Email address is from a service.",
@@ -342,166 +224,15 @@ def validate_email_by_service(email: str):
 
 @app.post("/check-free-email")
 def check_free_email(email: str):
+    if quick_reject(email):
+        return {"status": 400, "message": "Invalid email address."}
     try:
-        # Validate the email address
-        is_valid = validate_email(email)
+        # Validate the email address (syntax only; no DNS from this handler)
+        is_valid = validate_email(email, check_deliverability=False)
 
         # Check if the email address belongs to a free email provider
-        domain = re.search("@[\w.]+", email).group()[1:]
-        free_mail_providers = [
-            "gmail.com",
-            "yahoo.com",
-            "outlook.com",
-            "aol.com",
-            "protonmail.com",
-            "icloud.com",
-            "mail.com",
-            "zoho.com",
-            "yandex.com",
-            "gmx.com",
-            "hotmail.com",
-            "live.com",
-            "outlook.in",
-            "rediffmail.com",
-            "tutanota.com",
-            "fastmail.com",
-            "mail.ru",
-            "tutanota.de",
-            "hushmail.com",
-            "startmail.com",
-            "disroot.org",
-            "10minutemail.com",
-            "mailinator.com",
-            "guerrillamail.com",
-            "temp-mail.org",
-            "hide-my-email.com",
-            "cock.li",
-            "protonmail.ch",
-            "swissmail.org",
-            "posteo.de",
-            "tutamail.com",
-            "tutanota.it",
-            "tutanota.at",
-            "tutanota.eu",
-            "tutanota.nl",
-            "tutanota.fr",
-            "tutanota.es",
-            "tutanota.org",
-            "tutanota.io",
-            "tutamail.com",
-            "inbox.lv",
-            "inbox.lt",
-            "mail.ee",
-            "seznam.cz",
-            "azet.sk",
-            "post.sk",
-            "pobox.com",
-            "mailnesia.com",
-            "sharklasers.com",
-            "mytemp.email",
-            "eclipso.eu",
-            "tutamail.it",
-            "tutanota.no",
-            "tutanota.se",
-            "tutanota.com.au",
-            "zoho.eu",
-            "yopmail.com",
-            "trashmail.com",
-            "spikemail.com",
-            "tempmail.space",
-            "tempr.email",
-            "fakeinbox.com",
-            "fake-mail.net",
-            "mail.tm",
-            "secure-mail.biz",
-            "smailpro.com",
-            "mymail-in.com",
-            "jetable.org",
-            "trashmailer.com",
-            "torbox.ch",
-            "mailforspam.com",
-            "maildrop.cc",
-            "msgsafe.io",
-            "inboxkitten.com",
-            "deadaddress.com",
-            "enigmail.net",
-            "vivaldi.net",
-            "runbox.com",
-            "tutanota.uk",
-            "tutanota.us",
-            "tutanota.be",
-            "tutanota.me",
-            "tutanota.es",
-            "tutanota.de",
-            "tutanota.fi",
-            "tutanota.pl",
-            "tutanota.ru",
-            "tutanota.jp",
-            "tutanota.cn",
-            "tutanota.in",
-            "tutanota.co",
-            "tutamail.de",
-            "tutamail.net",
-            "protonmail.com.au",
-            "protonmail.at",
-            "protonmail.ch",
-            "protonmail.cz",
-            "protonmail.de",
-            "protonmail.dk",
-            "protonmail.es",
-            "protonmail.fi",
-            "protonmail.fr",
-            "protonmail.gr",
-            "protonmail.hu",
-            "protonmail.is",
-            "protonmail.it",
-            "protonmail.li",
-            "protonmail.lt",
-            "protonmail.lu",
-            "protonmail.nl",
-            "protonmail.no",
-            "protonmail.pl",
-            "protonmail.pt",
-            "protonmail.ro",
-            "protonmail.se",
-            "protonmail.si",
-            "protonmail.uk",
-            "protonmail.us",
-            "protonmail.xyz",
-            "tutamail.ch",
-            "tutamail.com.ar",
-            "tutamail.com.br",
-            "tutamail.com.cn",
-            "tutamail.com.mx",
-            "tutamail.com.tw",
-            "tutamail.com.ua",
-            "tutamail.com.vn",
-            "tutamail.co.za",
-            "tutamail.de",
-            "tutamail.fr",
-            "tutamail.in",
-            "tutamail.io",
-            "tutamail.jp",
-            "tutamail.kr",
-            "tutamail.net",
-            "tutamail.nl",
-            "tutamail.ru",
-            "tutamail.sg",
-            "tutamail.tw",
-            "tutamail.us",
-            "tutamail.xyz",
-            "tutanota.cl",
-            "tutanota.co.il",
-            "tutanota.com.co",
-            "tutanota.com.sg",
-            "tutanota.com.tr",
-            "tutanota.com.ua",
-            "tutanota.com.ve",
-            "tutanota.dk",
-            "tutanota.ec",
-        ]
-
-        is_free = domain in free_mail_providers
+        domain = _domain_of(email)
+        is_free = is_free_domain(domain)
 
         # Return the validation result and whether it's from a free email provider or not
         return {"status": 200, "is_free_email": is_free, "is_valid": is_valid}
@@ -511,76 +242,123 @@ def check_free_email(email: str):
         return {"status": 400, "message": f"Error: {e}"}
 
 
+@app.post("/comprehensive-validation")
+async def comprehensive_email_validation(email: str):
+    if quick_reject(email):
+        return {"email": email, "valid": False, "reason": "Invalid email syntax."}
+    # cheap checks first: syntax, then the disposable set, and only then DNS,
+    # so disposable addresses never cost an MX round trip
+    try:
+        validate_email(email, check_deliverability=False)
+    except (EmailSyntaxError, EmailNotValidError):
+        return {"email": email, "valid": False, "reason": "Invalid email syntax."}
+
+    domain = email.rpartition("@")[2].lower()
+    if is_disposable_domain(domain):
+        return {
+            "email": email,
+            "valid": False,
+            "disposable": True,
+            "reason": "Disposable email domain.",
+        }
+
+    mx_records = await get_mx_records(domain)
+    if not mx_records:
+        return {
+            "email": email,
+            "valid": False,
+            "disposable": False,
+            "reason": "No mail server found for the domain.",
+        }
+    return {"email": email, "valid": True, "disposable": False, "mx_records": mx_records}
+
+
+# pools sampled with random.choices so the hot path skips Faker's per-call
+# provider dispatch entirely
+_FAKE_FIRST_NAMES = [fake.first_name() for _ in range(1000)]
+_FAKE_LAST_NAMES = [fake.last_name() for _ in range(1000)]
+_FAKE_JOBS = [fake.job() for _ in range(1000)]
+_FAKE_DOMAINS = [fake.domain_name() for _ in range(1000)]
+
+
 # generate fake emails
 @app.get("/fake_email")
-async def generate_fake_business_email():
-    first_name = fake.first_name()
-    last_name = fake.last_name()
-    job_title = fake.job()
-    email_domain = fake.domain_name()
-    email = "{}.{}@{}".format(first_name.lower(), last_name.lower(), email_domain)
-    return {"email": email, "job_title": job_title}
+async def generate_fake_business_email(count: int = 1, realistic: bool = True):
+    count = max(1, min(count, 1000))
+    if not realistic:
+        # throwaway addresses for load tests and fixtures: one urandom-backed
+        # token per row, no name/job sampling at all
+        results = [
+            {"email": "user{}@example.test".format(secrets.token_hex(4)), "job_title": "n/a"}
+            for _ in range(count)
+        ]
+        if count == 1:
+            return results[0]
+        return results
+    first_names = random.choices(_FAKE_FIRST_NAMES, k=count)
+    last_names = random.choices(_FAKE_LAST_NAMES, k=count)
+    job_titles = random.choices(_FAKE_JOBS, k=count)
+    email_domains = random.choices(_FAKE_DOMAINS, k=count)
+    results = [
+        {
+            "email": "{}.{}@{}".format(first.lower(), last.lower(), domain),
+            "job_title": job,
+        }
+        for first, last, job, domain in zip(
+            first_names, last_names, job_titles, email_domains
+        )
+    ]
+    if count == 1:
+        return results[0]
+    return results
 
 
 # file emails vaildate in bulk
 @app.post("/bulk_email_syntax_check")
 async def validate_emails(file: UploadFile = File(...), column_name: str = "Emails"):
-    email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-    valid_emails = []
-    invalid_emails = []
     emails = []
     emails_limit = 999
-    valid_emails_count = 0
-    invalid_emails_count = 0
 
     try:
         if file.filename.endswith(".txt"):
-            txt_data = await file.read()
-            txt_text = txt_data.decode("utf-8-sig")
-            emails = txt_text.split("\n")
-            for i, email in enumerate(emails):
-                if re.match(email_pattern, email):
-                    valid_emails.append(email)
-                    valid_emails_count = valid_emails_count + 1
-                else:
-                    invalid_emails.append(email)
-                    invalid_emails_count = invalid_emails_count + 1
-
-                if i >= emails_limit:
-                    break
+            # decode straight off the spooled upload; islice stops reading at
+            # the limit, so neither the bytes nor a decoded copy are held whole
+            lines = io.TextIOWrapper(file.file, encoding="utf-8-sig")
+            emails = [line.rstrip("\n") for line in islice(lines, emails_limit + 1)]
 
         elif file.filename.endswith(".csv"):
-            csv_data = await file.read()
-            csv_text = csv_data.decode("utf-8-sig")
-            csv_reader = csv.DictReader(io.StringIO(csv_text))
-            email_col = column_name  # change to the name of the email column
-            for i, row in enumerate(csv_reader):
-                email = row[email_col]
-                if re.match(email_pattern, email):
-                    valid_emails.append(email)
-                    valid_emails_count = valid_emails_count + 1
-
-                else:
-                    invalid_emails.append(email)
-                    invalid_emails_count = invalid_emails_count + 1
-
-                if i >= emails_limit:
-                    break
+            text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+            csv_reader = csv.DictReader(text)
+            emails = [
+                row[column_name] for row in islice(csv_reader, emails_limit + 1)
+            ]
 
         elif file.filename.endswith(".xlsx"):
+            # imported on first use: openpyxl drags in the XML stack and
+            # costs real cold-start time, and most deployments never upload
+            # a spreadsheet
+            import openpyxl
+
             excel_data = await file.read()
-            workbook = openpyxl.load_workbook(excel_data)
-            worksheet = workbook.active
-            for i, row in enumerate(worksheet.iter_rows(values_only=True)):
-                email = row[0]  # assuming email is in the first column
-                if re.match(email_pattern, email):
-                    valid_emails.append(email)
-                    valid_emails_count = valid_emails_count + 1
-                else:
-                    invalid_emails.append(email)
-                    invalid_emails_count = invalid_emails_count + 1
-                if i >= emails_limit:
-                    break
+            # load_workbook needs a file-like object, not raw bytes; read_only
+            # streams rows instead of building the full cell graph
+            workbook = openpyxl.load_workbook(
+                io.BytesIO(excel_data), read_only=True, data_only=True
+            )
+            try:
+                worksheet = workbook.active
+                # blank rows read back as None and numeric cells as numbers;
+                # skip the former and coerce the rest so the matcher below
+                # only ever sees strings
+                emails = [
+                    str(row[0])
+                    for row in worksheet.iter_rows(
+                        values_only=True, max_col=1, max_row=emails_limit + 1
+                    )
+                    if row[0] is not None
+                ]
+            finally:
+                workbook.close()
         else:
             return {
                 "status": 400,
@@ -589,10 +367,16 @@ async def validate_emails(file: UploadFile = File(...), column_name: str = "Emai
     except:
         return {"status": 400, "message": "File is corrupt or not supported"}
 
+    # one C-speed pass per list instead of a Python-level append loop per row
+    match = _BULK_EMAIL_RE.match
+    mask = [bool(match(email)) for email in emails]
+    valid_emails = [email for email, ok in zip(emails, mask) if ok]
+    invalid_emails = [email for email, ok in zip(emails, mask) if not ok]
+
     return {
         "status": 200,
-        "valid_emails_count": valid_emails_count,
-        "invalid_emails_count": invalid_emails_count,
+        "valid_emails_count": len(valid_emails),
+        "invalid_emails_count": len(invalid_emails),
         "valid_emails": valid_emails,
         "invalid_emails": invalid_emails,
     }